@@ -3,18 +3,23 @@
 Shared utility functions for BPE tokenizer training experiments.
 """
 
-import json
+import resource
 import sys
 import time
-import tracemalloc
 from pathlib import Path
 
+import orjson
+
 # Add parent directory to path to import from tests
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tests.adapters import run_train_bpe
 from tests.common import gpt2_bytes_to_unicode
 
+# GPT-2 maps each byte to a single codepoint, so a token converts in one C-level
+# call by decoding it as latin-1 and translating with this table
+GPT2_BYTE_TRANSLATION = str.maketrans({chr(b): c for b, c in gpt2_bytes_to_unicode().items()})
+
 
 def format_time(seconds):
     """Format seconds into human-readable time."""
@@ -38,15 +43,34 @@ def format_bytes(bytes_size):
     return f"{bytes_size:.2f} TB"
 
 
+def get_peak_rss():
+    """
+    Return the peak resident set size in bytes of the largest single process:
+    this one, or any finished child (e.g. a BPE pretokenization pool worker).
+    This is not the sum across processes.
+    """
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports ru_maxrss in kilobytes, macOS in bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
 def analyze_vocab(vocab, merges, show_merges=True):
     """Analyze the trained vocabulary and merges."""
     print("\n" + "="*70)
     print("VOCABULARY ANALYSIS")
     print("="*70)
 
-    # Find longest token
-    longest_token = max(vocab.values(), key=len)
-    longest_token_id = [k for k, v in vocab.items() if v == longest_token][0]
+    # Find longest token and token length statistics in a single pass
+    longest_token_id, longest_token = None, b''
+    min_length, max_length, total_length = float('inf'), 0, 0
+    for token_id, token_bytes in vocab.items():
+        length = len(token_bytes)
+        total_length += length
+        if length > max_length:
+            max_length, longest_token_id, longest_token = length, token_id, token_bytes
+        if length < min_length:
+            min_length = length
 
     print(f"\nVocabulary size: {len(vocab)}")
     print(f"Number of merges: {len(merges)}")
@@ -55,46 +79,52 @@ def analyze_vocab(vocab, merges, show_merges=True):
     print(f"  Token ID: {longest_token_id}")
     print(f"  Length: {len(longest_token)} bytes")
     print(f"  Bytes (hex): {longest_token.hex()}")
-    try:
-        decoded = longest_token.decode('utf-8')
-        print(f"  Decoded: '{decoded}'")
-        # Return the decoded string for use in answers
-        return decoded
-    except UnicodeDecodeError:
+    # Decode each distinct token once; two valid UTF-8 strings concatenate
+    # to a valid one, so merged tokens never need decoding
+    decoded_cache = {}
+
+    def decode(token):
+        if token not in decoded_cache:
+            try:
+                decoded_cache[token] = token.decode('utf-8')
+            except UnicodeDecodeError:
+                decoded_cache[token] = None
+        return decoded_cache[token]
+
+    # Keep the decoded string to return for use in answers
+    longest_token_decoded = decode(longest_token)
+    if longest_token_decoded is not None:
+        print(f"  Decoded: '{longest_token_decoded}'")
+    else:
         print(f"  Decoded: [Cannot decode as UTF-8]")
-        return None
-    finally:
-        # Show token length statistics
-        token_lengths = [len(v) for v in vocab.values()]
-        avg_length = sum(token_lengths) / len(token_lengths)
-
-        print(f"\nToken length statistics:")
-        print(f"  Average: {avg_length:.2f} bytes")
-        print(f"  Min: {min(token_lengths)} bytes")
-        print(f"  Max: {max(token_lengths)} bytes")
-
-        if show_merges:
-            # Show first few merges
-            print(f"\nFirst 10 merges:")
-            for i, (token1, token2) in enumerate(merges[:10]):
-                try:
-                    token1_str = token1.decode('utf-8')
-                    token2_str = token2.decode('utf-8')
-                    merged_str = (token1 + token2).decode('utf-8')
-                    print(f"  {i+1}. '{token1_str}' + '{token2_str}' -> '{merged_str}'")
-                except UnicodeDecodeError:
-                    print(f"  {i+1}. {token1.hex()} + {token2.hex()} -> {(token1+token2).hex()}")
-
-            # Show last few merges
-            print(f"\nLast 10 merges:")
-            for i, (token1, token2) in enumerate(merges[-10:], start=len(merges)-9):
-                try:
-                    token1_str = token1.decode('utf-8')
-                    token2_str = token2.decode('utf-8')
-                    merged_str = (token1 + token2).decode('utf-8')
-                    print(f"  {i}. '{token1_str}' + '{token2_str}' -> '{merged_str}'")
-                except UnicodeDecodeError:
-                    print(f"  {i}. {token1.hex()} + {token2.hex()} -> {(token1+token2).hex()}")
+
+    # Show token length statistics
+    avg_length = total_length / len(vocab)
+
+    print(f"\nToken length statistics:")
+    print(f"  Average: {avg_length:.2f} bytes")
+    print(f"  Min: {min_length} bytes")
+    print(f"  Max: {max_length} bytes")
+
+    if show_merges:
+        def print_merge(i, token1, token2):
+            token1_str, token2_str = decode(token1), decode(token2)
+            if token1_str is not None and token2_str is not None:
+                print(f"  {i}. '{token1_str}' + '{token2_str}' -> '{token1_str + token2_str}'")
+            else:
+                print(f"  {i}. {token1.hex()} + {token2.hex()} -> {(token1+token2).hex()}")
+
+        # Show first few merges
+        print(f"\nFirst 10 merges:")
+        for i, (token1, token2) in enumerate(merges[:10], start=1):
+            print_merge(i, token1, token2)
+
+        # Show last few merges
+        print(f"\nLast 10 merges:")
+        for i, (token1, token2) in enumerate(merges[-10:], start=len(merges)-9):
+            print_merge(i, token1, token2)
+
+    return longest_token_decoded
 
 
 def save_vocab_and_merges(vocab, merges, output_dir, name_prefix=""):
@@ -104,43 +134,33 @@ def save_vocab_and_merges(vocab, merges, output_dir, name_prefix=""):
 
     # Convert vocab to GPT-2 format (token_id -> string)
     # Using token_id as key to avoid collisions when multiple token_bytes map to same string
-    byte_encoder = gpt2_bytes_to_unicode()
-
-    # Create vocab.json (token_id -> token_string)
-    vocab_gpt2 = {}
-    for token_id, token_bytes in vocab.items():
-        # Convert bytes to GPT-2 string representation
-        token_str = ''.join(byte_encoder[b] for b in token_bytes)
-        vocab_gpt2[str(token_id)] = token_str  # Use token_id as key to prevent collisions
-
-    vocab_path = output_dir / f"{name_prefix}vocab.json"
-    with open(vocab_path, 'w', encoding='utf-8') as f:
-        json.dump(vocab_gpt2, f, ensure_ascii=False, indent=2)
-    print(f"Saved vocabulary to: {vocab_path}")
-
-    # Create merges.txt (GPT-2 format)
-    merges_path = output_dir / f"{name_prefix}merges.txt"
-    with open(merges_path, 'w', encoding='utf-8') as f:
-        f.write("#version: 0.2\n")  # GPT-2 format header
-        for token1, token2 in merges:
-            token1_str = ''.join(byte_encoder[b] for b in token1)
-            token2_str = ''.join(byte_encoder[b] for b in token2)
-            f.write(f"{token1_str} {token2_str}\n")
-    print(f"Saved merges to: {merges_path}")
-
-    # Also save raw Python format for easy inspection
-    raw_vocab_path = output_dir / f"{name_prefix}vocab_raw.json"
-    with open(raw_vocab_path, 'w') as f:
-        # Convert bytes to hex strings for JSON serialization
-        vocab_serializable = {k: v.hex() for k, v in vocab.items()}
-        json.dump(vocab_serializable, f, indent=2)
-    print(f"Saved raw vocabulary to: {raw_vocab_path}")
-
-    raw_merges_path = output_dir / f"{name_prefix}merges_raw.txt"
-    with open(raw_merges_path, 'w') as f:
-        for token1, token2 in merges:
-            f.write(f"{token1.hex()} {token2.hex()}\n")
-    print(f"Saved raw merges to: {raw_merges_path}")
+    vocab_gpt2 = {
+        str(token_id): token_bytes.decode('latin-1').translate(GPT2_BYTE_TRANSLATION)
+        for token_id, token_bytes in vocab.items()
+    }
+
+    # GPT-2 format merges.txt: header, then one merge per line
+    merges_text = "#version: 0.2\n" + "".join(
+        f"{token1.decode('latin-1').translate(GPT2_BYTE_TRANSLATION)} "
+        f"{token2.decode('latin-1').translate(GPT2_BYTE_TRANSLATION)}\n"
+        for token1, token2 in merges
+    )
+
+    # Build every file in memory, then write each with a single buffered call.
+    # orjson emits compact UTF-8 JSON; use prettify_vocab.py to inspect it.
+    outputs = [
+        ("vocabulary", "vocab.json", orjson.dumps(vocab_gpt2)),
+        ("merges", "merges.txt", merges_text.encode('utf-8')),
+        # Also save raw Python format (bytes as hex strings) for easy inspection
+        ("raw vocabulary", "vocab_raw.json", orjson.dumps({str(k): v.hex() for k, v in vocab.items()})),
+        ("raw merges", "merges_raw.txt",
+         "".join(f"{token1.hex()} {token2.hex()}\n" for token1, token2 in merges).encode('utf-8')),
+    ]
+    for description, filename, data in outputs:
+        path = output_dir / f"{name_prefix}{filename}"
+        with open(path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+        print(f"Saved {description} to: {path}")
 
 
 def train_bpe_tokenizer(input_path, vocab_size, special_tokens, output_dir,
@@ -181,9 +201,6 @@ def train_bpe_tokenizer(input_path, vocab_size, special_tokens, output_dir,
     file_size = input_path.stat().st_size / (1024**3)  # GB
     print(f"  Input file size: {file_size:.2f} GB")
 
-    # Start memory tracking
-    tracemalloc.start()
-
     # Start timing
     start_time = time.time()
     print(f"\nStarting BPE training at {time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -200,9 +217,8 @@ def train_bpe_tokenizer(input_path, vocab_size, special_tokens, output_dir,
         end_time = time.time()
         elapsed_time = end_time - start_time
 
-        # Get memory usage
-        current_memory, peak_memory = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        # Get memory usage (kernel-reported peak RSS, no per-allocation overhead)
+        peak_memory = get_peak_rss()
 
         # Print results
         print("\n" + "="*70)
@@ -210,7 +226,7 @@ def train_bpe_tokenizer(input_path, vocab_size, special_tokens, output_dir,
         print("="*70)
 
         print(f"\nTime taken: {format_time(elapsed_time)}")
-        print(f"Peak memory usage: {format_bytes(peak_memory)}")
+        print(f"Peak memory usage: {format_bytes(peak_memory)} (largest single process, incl. pool workers)")
 
         # Analyze the vocabulary
         longest_token_decoded = analyze_vocab(vocab, merges)
@@ -244,7 +260,7 @@ def train_bpe_tokenizer(input_path, vocab_size, special_tokens, output_dir,
             print(f"  Time: {format_time(elapsed_time)}")
 
         if memory_limit_gb:
-            print(f"  Memory: {memory_gb:.2f} GB {'✓' if memory_gb <= memory_limit_gb else '✗ (exceeds limit)'}")
+            print(f"  Memory (largest single process): {memory_gb:.2f} GB {'✓' if memory_gb <= memory_limit_gb else '✗ (exceeds limit)'}")
         else:
             print(f"  Memory: {format_bytes(peak_memory)}")
 
@@ -7,26 +7,31 @@ This script answers question (b):
 OpenWebText."
 """
 
-import json
+import heapq
+from binascii import unhexlify
 from pathlib import Path
-from collections import Counter
+
+import orjson
+
+# ASCII control characters that str treats as whitespace but bytes does not
+_STR_ONLY_WHITESPACE = frozenset(b'\x1c\x1d\x1e\x1f')
 
 def load_tokenizer(output_dir, prefix):
     """Load vocab and merges from saved files."""
     output_dir = Path(output_dir)
 
     # Load raw vocab
-    with open(output_dir / f"{prefix}vocab_raw.json") as f:
-        vocab_hex = json.load(f)
-        vocab = {int(k): bytes.fromhex(v) for k, v in vocab_hex.items()}
+    with open(output_dir / f"{prefix}vocab_raw.json", 'rb') as f:
+        vocab_hex = orjson.loads(f.read())
+    vocab = {int(k): bytes.fromhex(v) for k, v in vocab_hex.items()}
 
     # Load raw merges
     merges = []
-    with open(output_dir / f"{prefix}merges_raw.txt") as f:
-        for line in f:
+    with open(output_dir / f"{prefix}merges_raw.txt", 'rb') as f:
+        for line in f.read().splitlines():
             if line.strip():
-                token1_hex, token2_hex = line.strip().split()
-                merges.append((bytes.fromhex(token1_hex), bytes.fromhex(token2_hex)))
+                token1_hex, token2_hex = line.split()
+                merges.append((unhexlify(token1_hex), unhexlify(token2_hex)))
 
     return vocab, merges
 
@@ -42,40 +47,61 @@ def analyze_tokenizer_characteristics(vocab, merges, name):
     print(f"  Vocabulary size: {len(vocab)}")
     print(f"  Number of merges: {len(merges)}")
 
+    # Gather length statistics, the longest tokens and token types in one pass
+    min_length, max_length, total_length = float('inf'), 0, 0
+    # Min-heap of (length, -position, token_id, token_bytes); -position keeps
+    # earlier tokens ahead on ties, matching a stable descending sort
+    longest_tokens = []
+    # Character type analysis (approximate - decode what we can)
+    alphanumeric_count = 0
+    special_char_count = 0
+    multi_word_count = 0
+
+    for position, (token_id, token_bytes) in enumerate(vocab.items()):
+        length = len(token_bytes)
+        total_length += length
+        if length < min_length:
+            min_length = length
+        if length > max_length:
+            max_length = length
+        entry = (length, -position, token_id, token_bytes)
+        if len(longest_tokens) < 5:
+            heapq.heappush(longest_tokens, entry)
+        elif entry > longest_tokens[0]:
+            heapq.heapreplace(longest_tokens, entry)
+
+        if token_bytes.isascii() and _STR_ONLY_WHITESPACE.isdisjoint(token_bytes):
+            # bytes.isalnum/isspace/split agree with str here, so skip decoding
+            token, space = token_bytes, b' '
+        else:
+            try:
+                token, space = token_bytes.decode('utf-8'), ' '
+            except UnicodeDecodeError:
+                continue
+        if token.isalnum():
+            alphanumeric_count += 1
+        elif not token.isspace():
+            special_char_count += 1
+        # maxsplit=1 stops at the second word instead of splitting the whole token
+        if space in token and len(token.split(maxsplit=1)) > 1:
+            multi_word_count += 1
+
     # Token length distribution
-    token_lengths = [len(v) for v in vocab.values()]
+    avg_length = total_length / len(vocab)
     print(f"\nToken Length Distribution:")
-    print(f"  Min: {min(token_lengths)} bytes")
-    print(f"  Max: {max(token_lengths)} bytes")
-    print(f"  Average: {sum(token_lengths)/len(token_lengths):.2f} bytes")
+    print(f"  Min: {min_length} bytes")
+    print(f"  Max: {max_length} bytes")
+    print(f"  Average: {avg_length:.2f} bytes")
 
     # Longest tokens
-    longest_tokens = sorted(vocab.items(), key=lambda x: len(x[1]), reverse=True)[:5]
     print(f"\nTop 5 Longest Tokens:")
-    for token_id, token_bytes in longest_tokens:
+    for _, _, token_id, token_bytes in sorted(longest_tokens, reverse=True):
         try:
             decoded = token_bytes.decode('utf-8')
             print(f"  {len(token_bytes)} bytes: '{decoded}'")
         except UnicodeDecodeError:
             print(f"  {len(token_bytes)} bytes: [non-UTF-8] {token_bytes.hex()[:40]}...")
 
-    # Character type analysis (approximate - decode what we can)
-    alphanumeric_count = 0
-    special_char_count = 0
-    multi_word_count = 0
-
-    for token_bytes in vocab.values():
-        try:
-            decoded = token_bytes.decode('utf-8')
-            if decoded.isalnum():
-                alphanumeric_count += 1
-            elif not decoded.isspace():
-                special_char_count += 1
-            if ' ' in decoded and len(decoded.split()) > 1:
-                multi_word_count += 1
-        except UnicodeDecodeError:
-            pass
-
     print(f"\nToken Type Distribution (approximate):")
     print(f"  Alphanumeric tokens: {alphanumeric_count} ({alphanumeric_count/len(vocab)*100:.1f}%)")
     print(f"  Special character tokens: {special_char_count} ({special_char_count/len(vocab)*100:.1f}%)")
@@ -99,8 +125,8 @@ def analyze_tokenizer_characteristics(vocab, merges, name):
     return {
         'vocab_size': len(vocab),
         'num_merges': len(merges),
-        'avg_token_length': sum(token_lengths)/len(token_lengths),
-        'max_token_length': max(token_lengths),
+        'avg_token_length': avg_length,
+        'max_token_length': max_length,
         'alphanumeric_pct': alphanumeric_count/len(vocab)*100,
         'multi_word_count': multi_word_count
     }
@@ -5,11 +5,9 @@ Regenerate vocab.json from vocab_raw.json using the corrected format.
 """
 
 import json
-import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from tests.common import gpt2_bytes_to_unicode
+from bpe_training_utils import GPT2_BYTE_TRANSLATION
 
 
 def fix_vocab_json(tokenizer_dir, name_prefix):
@@ -26,18 +24,17 @@ def fix_vocab_json(tokenizer_dir, name_prefix):
     print(f"  Loaded {len(vocab_raw)} tokens from {raw_vocab_path.name}")
 
     # Convert to GPT-2 format (token_id -> token_string)
-    byte_encoder = gpt2_bytes_to_unicode()
     vocab_gpt2 = {}
 
     for token_id_str, hex_bytes in vocab_raw.items():
         token_bytes = bytes.fromhex(hex_bytes)
-        token_str = ''.join(byte_encoder[b] for b in token_bytes)
+        token_str = token_bytes.decode('latin-1').translate(GPT2_BYTE_TRANSLATION)
         vocab_gpt2[token_id_str] = token_str  # Use token_id as key
 
     # Save corrected vocab.json
     vocab_path = tokenizer_dir / f"{name_prefix}_vocab.json"
     with open(vocab_path, 'w', encoding='utf-8') as f:
-        json.dump(vocab_gpt2, f, ensure_ascii=False, indent=2)
+        json.dump(vocab_gpt2, f, ensure_ascii=False, separators=(',', ':'))
 
     print(f"  ✓ Saved {len(vocab_gpt2)} tokens to {vocab_path.name}")
 
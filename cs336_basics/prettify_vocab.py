@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Pretty-print vocab JSON files for manual inspection.
+
+Training writes vocab.json and vocab_raw.json as compact JSON; this prints an
+indented copy to stdout, e.g.:
+
+    python prettify_vocab.py tokenizer_output/tinystories/tinystories_vocab.json | less
+"""
+
+import json
+import sys
+
+
+def prettify_vocab(vocab_path):
+    """Return the contents of a vocab JSON file as indented JSON."""
+    with open(vocab_path, encoding='utf-8') as f:
+        vocab = json.load(f)
+    return json.dumps(vocab, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} VOCAB_JSON [VOCAB_JSON ...]")
+        sys.exit(1)
+
+    for vocab_path in sys.argv[1:]:
+        print(prettify_vocab(vocab_path))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Train the TinyStories and OpenWebText BPE tokenizers concurrently.
+
+The two jobs share no state, so each runs in its own process pinned to a share
+of the CPUs (run_train_bpe sizes its worker pool from that affinity mask).
+Each process, including every pool worker it starts, also gets RLIMIT_AS set to
+the job's memory_limit_gb. This is only a per-process address-space guard: it
+does not cap the job's total memory across workers.
+
+Each job's output (including tqdm progress bars) goes to <output_dir>/train.log
+so the two runs do not interleave on the terminal.
+"""
+
+import multiprocessing as mp
+import os
+import resource
+import sys
+from pathlib import Path
+
+from bpe_training_utils import train_bpe_tokenizer
+from train_bpe_expts_owt import OWT_CONFIG
+from train_bpe_tinystories import TINYSTORIES_CONFIG
+
+# Fraction of the CPUs given to OpenWebText; TinyStories gets the rest
+OWT_CPU_FRACTION = 0.75
+
+
+def split_cpus(fraction):
+    """Split the available CPUs into two disjoint sets."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    if len(cpus) == 1:
+        return cpus, cpus
+    split = min(max(1, round(len(cpus) * fraction)), len(cpus) - 1)
+    return cpus[:split], cpus[split:]
+
+
+def job_log_path(config):
+    """Return the file a training job's stdout/stderr are written to."""
+    return Path(config["output_dir"]) / "train.log"
+
+
+def run_training_job(config, cpus):
+    """Child process entry point: redirect output, pin to CPUs, apply resource limits, then train."""
+    log_path = job_log_path(config)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log_file = open(log_path, "w")
+    # Redirect at the file descriptor level so pool workers and tqdm log there too
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(log_file.fileno(), sys.stdout.fileno())
+    os.dup2(log_file.fileno(), sys.stderr.fileno())
+    sys.stdout.reconfigure(line_buffering=True)
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    # Per-process address-space guard, inherited by each pool worker; after
+    # training only the largest single process's peak RSS is checked, not the total
+    memory_limit_gb = config.get("memory_limit_gb")
+    if memory_limit_gb:
+        limit = int(memory_limit_gb * 1024**3)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    train_bpe_tokenizer(**config)
+
+
+if __name__ == "__main__":
+    owt_cpus, tinystories_cpus = split_cpus(OWT_CPU_FRACTION)
+
+    ctx = mp.get_context("spawn")
+    configs = [OWT_CONFIG, TINYSTORIES_CONFIG]
+    jobs = [
+        ctx.Process(target=run_training_job, args=(OWT_CONFIG, owt_cpus), name="OpenWebText"),
+        ctx.Process(target=run_training_job, args=(TINYSTORIES_CONFIG, tinystories_cpus), name="TinyStories"),
+    ]
+    for job, config in zip(jobs, configs):
+        print(f"Starting {job.name} training, logging to: {job_log_path(config)}")
+        job.start()
+    for job in jobs:
+        job.join()
+
+    print("\n" + "="*70)
+    print("ALL TRAINING JOBS FINISHED")
+    print("="*70)
+    for job, config in zip(jobs, configs):
+        status = "✓" if job.exitcode == 0 else f"✗ (exit code {job.exitcode})"
+        print(f"  {job.name}: {status}  (log: {job_log_path(config)})")
+
+    if any(job.exitcode != 0 for job in jobs):
+        exit(1)
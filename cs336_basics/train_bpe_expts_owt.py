@@ -13,16 +13,18 @@ Resource requirements: ≤ 12 hours, ≤ 100GB RAM
 
 from bpe_training_utils import train_bpe_tokenizer
 
+OWT_CONFIG = dict(
+    input_path="/home/lifans/cs336/data/owt_train.txt",
+    vocab_size=32000,
+    special_tokens=["<|endoftext|>"],
+    output_dir="/home/lifans/cs336/cs336-assignment1-basics/tokenizer_output/openwebtext",
+    dataset_name="OpenWebText",
+    time_limit_hours=12,
+    memory_limit_gb=100
+)
+
 if __name__ == "__main__":
-    vocab, merges, time_taken, memory_used, longest_token = train_bpe_tokenizer(
-        input_path="/home/lifans/cs336/data/owt_train.txt",
-        vocab_size=32000,
-        special_tokens=["<|endoftext|>"],
-        output_dir="/home/lifans/cs336/cs336-assignment1-basics/tokenizer_output/openwebtext",
-        dataset_name="OpenWebText",
-        time_limit_hours=12,
-        memory_limit_gb=100
-    )
+    vocab, merges, time_taken, memory_used, longest_token = train_bpe_tokenizer(**OWT_CONFIG)
 
     print("\n" + "="*70)
     print("ANSWER TO QUESTION (a)")
@@ -563,6 +563,7 @@ def get_tokenizer(
 
 
 # Helper functions for BPE training (module-level for multiprocessing)
+import mmap
 import re
 import regex
 from collections import Counter
@@ -579,22 +580,29 @@ def _process_chunk_for_bpe(args):
     input_path, start, end, special_tokens_pattern = args
     chunk_word_freqs = Counter()
 
-    with open(input_path, "rb") as f:
-        f.seek(start)
-        chunk = f.read(end - start).decode("utf-8", errors="ignore")
-
-        # Split on special tokens to prevent merging across boundaries
-        if special_tokens_pattern:
-            text_segments = re.split(special_tokens_pattern, chunk)
-        else:
-            text_segments = [chunk]
+    # Decode straight from a read-only mapping of just this chunk so it is never
+    # copied into an intermediate bytes object (mmap offsets must be aligned).
+    # The mapping is closed before pre-tokenization so its pages are released.
+    offset = start - start % mmap.ALLOCATIONGRANULARITY
+    with open(input_path, "rb") as f, \
+            mmap.mmap(f.fileno(), end - offset, access=mmap.ACCESS_READ, offset=offset) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view:
+            chunk = str(view[start - offset:], "utf-8", "ignore")
+
+    # Split on special tokens to prevent merging across boundaries
+    if special_tokens_pattern:
+        text_segments = re.split(special_tokens_pattern, chunk)
+    else:
+        text_segments = [chunk]
 
-        # Pre-tokenize each segment separately
-        for segment in text_segments:
-            if segment:  # Skip empty segments
-                pre_tokens = _pre_tokenize(segment)
-                for token in pre_tokens:
-                    chunk_word_freqs[token] += 1
+    # Pre-tokenize each segment separately
+    for segment in text_segments:
+        if segment:  # Skip empty segments
+            pre_tokens = _pre_tokenize(segment)
+            for token in pre_tokens:
+                chunk_word_freqs[token] += 1
 
     return chunk_word_freqs
 
@@ -642,9 +650,14 @@ def run_train_bpe(
 
     with open(input_path, "rb") as f:
         # Use more processes for faster pre-tokenization
-        # Use min of 32 or cpu_count() to avoid overwhelming the system
+        # Use min of 32 or the CPUs this process may run on to avoid overwhelming
+        # the system (respects sched_setaffinity, unlike os.cpu_count())
         import os
-        num_processes = min(32, os.cpu_count() or 4)
+        if hasattr(os, "sched_getaffinity"):
+            available_cpus = len(os.sched_getaffinity(0))
+        else:
+            available_cpus = os.cpu_count() or 4
+        num_processes = min(32, available_cpus)
         boundaries = find_chunk_boundaries(f, num_processes, b"<|endoftext|>")
 
     print(f"      Found {len(boundaries)-1} chunks in {time.time()-step_start:.2f}s")